@@ -5,7 +5,7 @@
 """A tool to store credits related to a file found in OpenGameArt.org"""
 import sys
 import signal
-from os.path import isfile, basename, splitext, isdir
+from os.path import isfile, basename, splitext, isdir, abspath
 from os import listdir, chdir
 import argparse
 import mimetypes
@@ -14,14 +14,18 @@ from lxml.html import HtmlElement as Element
 from .selector import choose, first, get_fname
 from .unarchiver import Unarchiver
 from .www import request_url, download
-from .credit_file import parse, write, _get_content
+from .credit_file import parse, write, archive_name, _get_content
+from .probe import probe_file, PROBED_KEYS
+from .pack import get_pack
+from .dupes import dupes
 
 ALWAYS_GET = False
 
 KEYS_HEADER = [
     'title', 'collection', 'sub collection', 'artist', 'date', 'license',
     'url', 'url artist', 'url file',
-    'media ext', 'media file'
+    'media ext', 'media file', 'media format', 'media width', 'media height',
+    'media duration', 'media sample rate', 'media channels'
 ]
 KEYS_FOOTER = [
     'comment'
@@ -60,20 +64,22 @@ KEYS_XPATH = {
 
 
 def main(creditfile='', url='', html='', mediafile='',
-         directory='', dl=False, renew=False):
+         directory='', dl=False, renew=False, pack='', offline=False):
     """
     main . what else ?
     mmm. pylint dislike the fact of using command args as function argument
 
     Function : Fetch missing datas / credit informations
     """
+    if pack:  # the recursive mode changes the working directory
+        pack = abspath(pack)
     if directory:
         chdir(directory)
         for fname in listdir('.'):
             if isfile(fname) and fname.endswith('.txt'):
-                main(creditfile=fname, dl=dl)
+                main(creditfile=fname, dl=dl, pack=pack, offline=offline)
             elif isdir(fname):
-                main(directory=fname, dl=dl)
+                main(directory=fname, dl=dl, pack=pack, offline=offline)
         chdir('..')
         return
     print('*' * 34)
@@ -99,15 +105,30 @@ def main(creditfile='', url='', html='', mediafile='',
 
                 refcredit['title~'] = _get_title(refcredit['media file'])
 
+    def _update_probed_keys(infos):
+        # forget what was probed from a previous media
+        for key in PROBED_KEYS:
+            refcredit.pop(key, None)
+        refcredit.update(infos)
+
     def _update_refcredit():
         # refresh refcredit content, from url or html
+        # (return False when the page is missing from the pack)
         if html:
             html_content = '\n'.join(_get_content(html))
+        elif url and offline:
+            refcredit['url'] = url
+            html_content = get_pack(pack).get(url)
+            if not html_content:
+                print('No page stored for %s' % url)
+                return False
         elif url:
             refcredit['url'] = url
             response = request_url(url)
             if response:
                 html_content = response.read()
+                if pack:
+                    get_pack(pack).add(url, html_content)
             else:
                 print('Failing to get info from url')
                 return
@@ -155,7 +176,8 @@ def main(creditfile='', url='', html='', mediafile='',
     refcredit = refcredit_orig.copy()
     url = url or first(refcredit.get('url'))
     step = 'fetching datas from url'
-    _update_refcredit()
+    if _update_refcredit() is False:
+        return
     if isfile(mediafile) and not refcredit:
         print('Media file only (%s) is not enought to create a credit file' % mediafile)
         return
@@ -179,10 +201,8 @@ def main(creditfile='', url='', html='', mediafile='',
         print('media  : %s' % mediafile)
         step = 'downloading media file'
     else:
-        dl_file_name = (
-            '%s-%s' % (
-                first(refcredit['artist']), basename(file_to_dl))
-        ).replace('%20', ' ')
+        dl_file_name = archive_name(first(refcredit.get('artist')),
+                                    file_to_dl)
         print('archive: %s' % dl_file_name)
         step = 'downloading archive file'
 
@@ -200,7 +220,8 @@ def main(creditfile='', url='', html='', mediafile='',
         return
 
     if dl_file_name == mediafile:
-        pass
+        step = 'probing media file'
+        _update_probed_keys(probe_file(mediafile))
     else:
         step = 'extracting file'
         media_file_to_extract = first(refcredit.get('media file', ''))
@@ -223,9 +244,12 @@ def main(creditfile='', url='', html='', mediafile='',
             if not media_file_to_extract or renew:
                 media_file_to_extract = choose(files, "'media file' for '%s'" % name,
                                                defaultinput=name)
-            unarchiver.extract_file_as(
-                media_file_to_extract, get_media_file_name())
+            media_file_name = get_media_file_name()
+            unarchiver.extract_file_as(media_file_to_extract, media_file_name)
             refcredit['media file'] = media_file_to_extract
+            step = 'probing media file'
+            # the member has just been written : no need to decompress it again
+            _update_probed_keys(probe_file(media_file_name))
             _update_title_for_collection(files, 'archive')
         except KeyError:
             print('No media found')
@@ -258,6 +282,13 @@ def parse_args():
         print("\n".join(KEYS_HEADER + KEYS_FOOTER))
         sys.exit(0)
 
+    if sys.argv[1:2] == ['dupes']:
+        directory = sys.argv[2] if sys.argv[2:] else '.'
+        if not isdir(directory):
+            sys.exit('usage: ogaget dupes [DIRECTORY]')
+        dupes(directory)
+        sys.exit(0)
+
     if sys.argv[1:] and not sys.argv[1].startswith('-'):
         arg = sys.argv[1]
         sys.argv.insert(1, (
@@ -280,12 +311,18 @@ def parse_args():
                         help="download the media (choices are prompted if many are found)")
     parser.add_argument('-renew', action="store_true",
                         help="force a choice prompt (avoid stored infos)")
+    parser.add_argument('-pack', action="store", default='',
+                        help="a pack file where fetched pages are stored")
+    parser.add_argument('-offline', action="store_true",
+                        help="read pages from the pack instead of the url")
     parser.add_argument('--recursive', action="store", dest="directory",
                         help="act recursively")
     parser.add_argument('-m', action="store", dest='mediafile', default='',
                         help="the mediafile (used for naming credit file)")
 
     args = parser.parse_args()
+    if args.offline and not args.pack:
+        parser.error('-offline requires -pack')
     if not sys.argv[1:] or (args.directory and not isdir(args.directory)):
         parser.print_help()
 
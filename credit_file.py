@@ -19,7 +19,7 @@
 """
 import re
 import os
-from os.path import isfile
+from os.path import isfile, basename
 INLINE_KEYS = ['license']
 
 
@@ -31,6 +31,17 @@ def _get_content(fname):
     return ret
 
 
+def archive_name(artist, url_file):
+    """
+    Return the local name of the archive downloaded from 'url_file'.
+    The name is prefixed with the artist, when known.
+    """
+    name = basename(url_file)
+    if artist:
+        name = '%s-%s' % (artist, name)
+    return name.replace('%20', ' ')
+
+
 def _write(fname, lines):
     with open(fname, "w") as buf:
         buf.writelines(lines)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2019 luffah <contact@luffah.xyz>
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+"""
+Find duplicate media and archives in a tree of credit files.
+
+Files are grouped by size, then by a hash of their first and last blocks,
+and only the remaining candidates are fully hashed.
+"""
+import hashlib
+from os import walk, listdir, lstat
+from os.path import join, dirname, basename, splitext
+from stat import S_ISREG
+from concurrent.futures import ThreadPoolExecutor
+from .credit_file import parse, archive_name
+from .selector import first
+from .www import _filesize
+
+BLOCK_SIZE = 65536
+SKIPPED_EXTS = ('.txt', '.part')
+
+
+def _partial_hash(fname):
+    hsh = hashlib.sha1()
+    try:
+        with open(fname, 'rb') as fbuf:
+            hsh.update(fbuf.read(BLOCK_SIZE))
+            size = fbuf.seek(0, 2)
+            fbuf.seek(max(BLOCK_SIZE, size - BLOCK_SIZE))
+            hsh.update(fbuf.read(BLOCK_SIZE))
+    except OSError as err:
+        print('%s skipped : %s' % (fname, err.strerror))
+        return None
+    return hsh.digest()
+
+
+def _full_hash(fname):
+    hsh = hashlib.sha1()
+    try:
+        with open(fname, 'rb') as fbuf:
+            buf = True
+            while buf:
+                buf = fbuf.read(16 * BLOCK_SIZE)
+                hsh.update(buf)
+    except OSError as err:
+        print('%s skipped : %s' % (fname, err.strerror))
+        return None
+    return hsh.digest()
+
+
+def _regroup(groups, hash_func, pool):
+    """
+    Split each group of (size, files) according to hash_func.
+    Unreadable files (hashed as None) are dropped.
+    """
+    files = [f for _, group in groups for f in group]
+    hashes = dict(zip(files, pool.map(hash_func, files)))
+    ret = []
+    for size, group in groups:
+        by_hash = {}
+        for fname in group:
+            if hashes[fname] is not None:
+                by_hash.setdefault(hashes[fname], []).append(fname)
+        ret += [(size, g) for g in by_hash.values() if len(g) > 1]
+    return ret
+
+
+def find_dupes(directory, workers=None):
+    """
+    Return (groups, links) where groups is a list of (size, files) with
+    files having the same content, biggest wastes of space first.
+    Hard links are counted once : links gives the other names of a file.
+    """
+    sizes = {}
+    inodes = {}
+    links = {}
+    for root, _, files in walk(directory):
+        for fname in files:
+            path = join(root, fname)
+            if fname.endswith(SKIPPED_EXTS):
+                continue
+            try:
+                stat = lstat(path)
+            except OSError:
+                continue
+            if not S_ISREG(stat.st_mode) or not stat.st_size:
+                continue
+            inode = (stat.st_dev, stat.st_ino)
+            if inode in inodes:
+                links.setdefault(inodes[inode], []).append(path)
+                continue
+            inodes[inode] = path
+            sizes.setdefault(stat.st_size, []).append(path)
+    groups = [(size, g) for size, g in sizes.items() if len(g) > 1]
+
+    with ThreadPoolExecutor(workers) as pool:
+        groups = _regroup(groups, _partial_hash, pool)
+        # head and tail blocks already cover the smallest files
+        groups = (
+            [(size, g) for size, g in groups if size <= 2 * BLOCK_SIZE] +
+            _regroup([(size, g) for size, g in groups
+                      if size > 2 * BLOCK_SIZE], _full_hash, pool)
+        )
+    return (sorted(groups, key=lambda g: -g[0] * (len(g[1]) - 1)), links)
+
+
+def _owned_files(creditfile):
+    """ Return the files named by main() after the credit file infos. """
+    try:
+        infos = parse(creditfile)
+    except (OSError, UnicodeDecodeError):
+        print('%s skipped : unreadable credit file' % creditfile)
+        return set()
+    directory = dirname(creditfile)
+    name = splitext(basename(creditfile))[0]
+    exts = infos.get('media ext', []) + [
+        splitext(f)[1]
+        for f in infos.get('media file', []) + infos.get('url file', [])
+    ]
+    owned = set(join(directory, name + ext) for ext in exts if ext)
+    url_file = first(infos.get('url file'))
+    if url_file:
+        owned.add(join(directory, archive_name(
+            first(infos.get('artist')), url_file)))
+    return owned
+
+
+def dupes(directory):
+    """ Print the duplicate files found in directory, with their credits. """
+    groups, links = find_dupes(directory)
+    owners = {}
+    for path in set(dirname(f) for _, group in groups for g in group
+                    for f in [g] + links.get(g, [])):
+        for fname in listdir(path):
+            if fname.endswith('.txt'):
+                creditfile = join(path, fname)
+                for owned in _owned_files(creditfile):
+                    owners.setdefault(owned, []).append(creditfile)
+
+    wasted = 0
+    for size, group in groups:
+        print('*' * 34)
+        print('%s x %d' % (_filesize(size), len(group)))
+        for fname in sorted(group):
+            names = [fname] + links.get(fname, [])
+            credits = [c for n in names for c in owners.get(n, [])]
+            print('%s (%s)' % (
+                ' = '.join(names), ', '.join(credits) or 'no credit file'))
+        wasted += size * (len(group) - 1)
+    print('%d duplicate sets, %s to reclaim' % (len(groups), _filesize(wasted)))
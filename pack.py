@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2019 luffah <contact@luffah.xyz>
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+"""
+Store fetched pages in a pack, to replay credit extraction offline.
+
+The pack is an append-only file of zlib-compressed pages.
+Its index (pack name + '.idx') has one line per page :
+```
+offset size date url
+```
+When a url is stored many times, the last line wins.
+"""
+import mmap
+import time
+import zlib
+from .credit_file import _get_content
+
+_PACKS = {}
+
+
+class Pack(object):
+
+    def __init__(self, fname):
+        self.fname = fname
+        self.index_fname = fname + '.idx'
+        self.index = {}
+        self._map = None
+        self._torn = False  # the index does not end with a new line
+        for line in _get_content(self.index_fname):
+            self._torn = not line.endswith('\n')
+            try:
+                offset, size, date, url = line.rstrip('\n').split(' ', 3)
+                self.index[url] = (int(offset), int(size), date)
+            except ValueError:  # a line torn by an interrupted append
+                continue
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+        with open(self.fname, 'rb') as fbuf:
+            self._map = mmap.mmap(fbuf.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def get(self, url):
+        """ Return the last page stored for url (or None). """
+        if url not in self.index:
+            return None
+        offset, size, _ = self.index[url]
+        if self._map is None or offset + size > len(self._map):
+            self._remap()
+        try:
+            return zlib.decompress(self._map[offset:offset + size])
+        except zlib.error:  # damaged or truncated pack
+            return None
+
+    def add(self, url, content):
+        """ Append content as the page of url (unless it is unchanged). """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        if self.get(url) == content:
+            return
+        data = zlib.compress(content, 9)
+        with open(self.fname, 'ab') as fbuf:
+            offset = fbuf.tell()
+            fbuf.write(data)
+        date = time.strftime('%Y-%m-%dT%H:%M:%S')
+        with open(self.index_fname, 'a') as fbuf:
+            if self._torn:
+                fbuf.write('\n')
+                self._torn = False
+            fbuf.write('%d %d %s %s\n' % (offset, len(data), date, url))
+        self.index[url] = (offset, len(data), date)
+
+
+def get_pack(fname):
+    """ Return the Pack stored in fname (opened once per run). """
+    if fname not in _PACKS:
+        _PACKS[fname] = Pack(fname)
+    return _PACKS[fname]
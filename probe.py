@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2019 luffah <contact@luffah.xyz>
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+"""
+Read media properties (format, dimensions, duration...) from file headers.
+Nothing is decoded : only a few small reads are done on each file, so it
+works as well on a file on disk than on a member of an archive.
+"""
+import struct
+import tarfile
+import zipfile
+import zlib
+
+OGG_TAIL_SIZE = 65536  # an ogg page is at most 65307 bytes
+
+
+def _read(fobj, size):
+    data = fobj.read(size)
+    if len(data) < size:
+        raise ValueError('truncated header')
+    return data
+
+
+def _probe_png(fobj):
+    head = _read(fobj, 24)
+    if head[12:16] != b'IHDR':
+        raise ValueError('missing IHDR chunk')
+    width, height = struct.unpack('>II', head[16:24])
+    return {'format': 'png', 'width': width, 'height': height}
+
+
+def _probe_gif(fobj):
+    head = _read(fobj, 10)
+    width, height = struct.unpack('<HH', head[6:10])
+    return {'format': 'gif', 'width': width, 'height': height}
+
+
+def _probe_jpeg(fobj):
+    # walk through segments until a "start of frame" (SOFn) one
+    fobj.seek(2)
+    while True:
+        marker = _read(fobj, 1)
+        if marker != b'\xff':
+            raise ValueError('bad jpeg marker')
+        while marker == b'\xff':  # fill bytes
+            marker = _read(fobj, 1)
+        code = marker[0]
+        if code == 0xd9:  # end of image
+            raise ValueError('no frame found')
+        if 0xd0 <= code <= 0xd8 or code == 0x01:  # no payload
+            continue
+        size = struct.unpack('>H', _read(fobj, 2))[0]
+        if 0xc0 <= code <= 0xcf and code not in (0xc4, 0xc8, 0xcc):
+            height, width = struct.unpack('>xHH', _read(fobj, 5))
+            return {'format': 'jpeg', 'width': width, 'height': height}
+        fobj.seek(size - 2, 1)
+
+
+def _probe_wav(fobj):
+    fobj.seek(12)
+    infos = {'format': 'wav'}
+    byte_rate = 0
+    while True:
+        chunk = fobj.read(8)
+        if len(chunk) < 8:
+            return infos
+        chunk_id, size = struct.unpack('<4sI', chunk)
+        if chunk_id == b'fmt ':
+            (infos['channels'], infos['sample rate'],
+             byte_rate) = struct.unpack('<2xHII', _read(fobj, 12))
+            fobj.seek(size - 12 + size % 2, 1)
+        elif chunk_id == b'data':
+            if byte_rate:
+                infos['duration'] = size / byte_rate
+            return infos
+        else:
+            fobj.seek(size + size % 2, 1)
+
+
+def _probe_flac(fobj):
+    block = _read(fobj, 42)
+    if block[4] & 0x7f != 0:  # STREAMINFO is always the first block
+        raise ValueError('missing STREAMINFO block')
+    bits = int.from_bytes(block[18:26], 'big')
+    rate = bits >> 44
+    samples = bits & 0xfffffffff
+    infos = {'format': 'flac', 'sample rate': rate,
+             'channels': ((bits >> 41) & 0x7) + 1}
+    if rate and samples:
+        infos['duration'] = samples / rate
+    return infos
+
+
+def _probe_ogg(fobj):
+    head = _read(fobj, 27)
+    serial = head[14:18]
+    fobj.seek(head[26], 1)  # segment table
+    packet = fobj.read(19)
+    if packet.startswith(b'\x01vorbis'):
+        channels, rate = struct.unpack('<BI', packet[11:16])
+        infos = {'format': 'ogg vorbis', 'channels': channels,
+                 'sample rate': rate}
+        (skip, granule_rate) = (0, rate)
+    elif packet.startswith(b'OpusHead'):
+        channels, skip, rate = struct.unpack('<BHI', packet[9:16])
+        infos = {'format': 'ogg opus', 'channels': channels,
+                 'sample rate': rate or 48000}
+        granule_rate = 48000  # opus granules are always at 48 kHz
+    else:
+        return {'format': 'ogg'}
+
+    # the granule position of the last page gives the length of the stream
+    # (seeking once and forward, an archive member is decompressed once)
+    try:
+        fobj.seek(-OGG_TAIL_SIZE, 2)
+    except OSError:  # files shorter than OGG_TAIL_SIZE
+        fobj.seek(0)
+    tail = fobj.read(OGG_TAIL_SIZE)
+    pos = tail.rfind(b'OggS')
+    while pos >= 0 and tail[pos + 14:pos + 18] != serial:
+        pos = tail.rfind(b'OggS', 0, pos)
+    if pos >= 0 and granule_rate:
+        granule = struct.unpack('<q', tail[pos + 6:pos + 14])[0]
+        if granule > skip:
+            infos['duration'] = (granule - skip) / granule_rate
+    return infos
+
+
+PROBES = [
+    (b'\x89PNG\r\n\x1a\n', _probe_png),
+    (b'GIF87a', _probe_gif),
+    (b'GIF89a', _probe_gif),
+    (b'\xff\xd8', _probe_jpeg),
+    (b'RIFF', _probe_wav),
+    (b'fLaC', _probe_flac),
+    (b'OggS', _probe_ogg),
+]
+
+PROBED_KEYS = ['media format', 'media width', 'media height',
+               'media duration', 'media sample rate', 'media channels']
+
+# errors raised by broken files or broken archive members
+PROBE_ERRORS = (ValueError, struct.error, OSError, EOFError, zlib.error,
+                zipfile.BadZipFile, tarfile.TarError)
+
+FORMATS = {
+    'duration': lambda val: '%.3f' % val,
+}
+
+
+def probe(fobj):
+    """
+    Return the credit keys ('media format', 'media duration'...) guessed
+    from the headers of a seekable binary file object.
+    Unknown or broken files give an empty dictionnary.
+    """
+    try:
+        head = fobj.read(12)
+        for magic, probe_fmt in PROBES:
+            if head.startswith(magic):
+                if magic == b'RIFF' and head[8:12] != b'WAVE':
+                    continue
+                fobj.seek(0)
+                return {
+                    'media ' + k: [FORMATS.get(k, str)(v)]
+                    for k, v in probe_fmt(fobj).items()
+                }
+    except PROBE_ERRORS:
+        pass
+    return {}
+
+
+def probe_file(fname):
+    """ Return the credit keys guessed from the headers of fname. """
+    try:
+        with open(fname, 'rb') as fbuf:
+            return probe(fbuf)
+    except OSError:
+        return {}
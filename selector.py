@@ -55,6 +55,9 @@ def get_fname(fname):
 
 class FuzzySelector(object):
     BG = [curses.A_NORMAL, curses.A_REVERSE, curses.A_UNDERLINE]
+    BURST_DELAY = 30  # ms to wait for the next key of a burst
+    FILTERED_KEYS = (curses.KEY_ENTER, ord('\n'), ord('\r'),
+                     curses.KEY_UP, curses.KEY_DOWN)
 
     def move(self, i):
         self.visible_idx = min(max(self.visible_idx + i, 0),
@@ -78,32 +81,49 @@ class FuzzySelector(object):
         return len(matched)
 
     def redraw(self, screen):
-        screen.clear()
         y = 1  # first line
         max_y, max_x = screen.getmaxyx()
         max_y -= 2
         max_x -= 2
 
-        def _draw_lines(lines):
-            nonlocal y
-            for l, attridx in lines:
-                if y > max_y:
-                    return
-                screen.addnstr(y, 1,
+        # only the visible rows are built
+        rows = []
+        if self.title:
+            rows += [(l, 0) for l in self.title.split('\n')]
+        rows.append(('>' + self.input + '█', 2))
+        page = max(1, max_y - len(rows))
+        start = int(self.visible_idx / page) * page
+        rows += [
+            (l, int(idx == self.idx))
+            for idx, l in self.suggestions[start:start + page]
+        ]
+        rows = rows[:max(0, max_y)]
+
+        # and only the rows which differ from the screen are repainted
+        for i in range(min(max(len(rows), len(self.drawn)), max(0, max_y))):
+            row = rows[i] if i < len(rows) else None
+            if i < len(self.drawn) and self.drawn[i] == row:
+                continue
+            screen.move(y + i, 1)
+            screen.clrtoeol()
+            if row:
+                l, attridx = row
+                screen.addnstr(y + i, 1,
                                l[max(0, len(l)-max_x):], max_x,
                                self.BG[attridx])
-                y += 1
+        self.drawn = rows
 
-        if self.title:
-            _draw_lines((l, 0) for l in self.title.split('\n'))
-
-        _draw_lines([('>' + self.input + '█', 2)])
-        _draw_lines([
-            (l, int(idx == self.idx))
-            for idx, l in self.suggestions
-        ][int(self.visible_idx/(max_y-2))*(max_y-2):])
+        screen.noutrefresh()
+        curses.doupdate()
 
-        screen.refresh()
+    def getkeys(self, screen):
+        """ Return the burst of keys typed from now (at least one). """
+        keys = [screen.getch()]
+        screen.timeout(self.BURST_DELAY)
+        while keys[-1] != -1:
+            keys.append(screen.getch())
+        screen.timeout(-1)
+        return keys[:-1]
 
     def curse_ui(self, screen):
         curses.use_default_colors()
@@ -111,20 +131,29 @@ class FuzzySelector(object):
 
         while True:
             self.redraw(screen)
-            c = screen.getch()
-            if c in (curses.KEY_ENTER, ord('\n'), ord('\r')):
-                return self.idx
-            elif c == curses.KEY_UP:
-                self.move(-1)
-            elif c == curses.KEY_DOWN:
-                self.move(1)
-            elif c in (curses.KEY_LEFT, curses.KEY_RIGHT):
-                pass
-            else:
-                if c == curses.KEY_BACKSPACE:
-                    self.input = self.input[:-1]
+            edited = False  # suggestions are filtered once per burst
+            for c in self.getkeys(screen):
+                if edited and c in self.FILTERED_KEYS:
+                    self.update(self.items)
+                    edited = False
+                if c in (curses.KEY_ENTER, ord('\n'), ord('\r')):
+                    return self.idx
+                elif c == curses.KEY_UP:
+                    self.move(-1)
+                elif c == curses.KEY_DOWN:
+                    self.move(1)
+                elif c in (curses.KEY_LEFT, curses.KEY_RIGHT):
+                    pass
+                elif c == curses.KEY_RESIZE:
+                    screen.clear()
+                    self.drawn = []
                 else:
-                    self.input += chr(c)
+                    if c == curses.KEY_BACKSPACE:
+                        self.input = self.input[:-1]
+                    else:
+                        self.input += chr(c)
+                    edited = True
+            if edited:
                 self.update(self.items)
 
     def get(self, items, title=None, defaultinput=''):
@@ -133,6 +162,7 @@ class FuzzySelector(object):
         self.input = defaultinput
         self.idx = 0
         self.visible_idx = 0
+        self.drawn = []
         if not self.update(self.items):
             self.input = ''
         return curses.wrapper(self.curse_ui)
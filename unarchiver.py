@@ -39,6 +39,13 @@ class Unarchiver(object):
                     open(target, "wb") as tgt:
                         shutil.copyfileobj(src, tgt)
 
+    def open_member(self, name):
+        """ Return a binary file object reading the member name. """
+        ar = self.archive
+        if self.type == 'tar':
+            return ar.extractfile(ar.getmember(name))
+        return ar.open(ar.getinfo(name))
+
     def getfiles(self, test=lambda a:True):
         files = []
         if self.type == 'tar':